@@ -0,0 +1,44 @@
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser
+
+# Only build the parse tree for tags that can hold the main content, plus the
+# unwanted sections so the divs inside them are removed along with them
+MAIN_CONTENT_STRAINER = SoupStrainer(['main', 'article', 'div', 'nav', 'header', 'footer', 'aside', 'form'])
+# Divs whose class mentions content/main/article, like the rendered-page check
+CONTENT_DIV_SELECTOR = 'div[class*=content i], div[class*=main i], div[class*=article i]'
+
+# Function to extract main content from raw HTML without a browser
+def extract_static_content(html):
+    """Extract main content from static HTML using selectolax."""
+    tree = LexborHTMLParser(html)
+    # Remove unwanted sections (footer, nav, etc.)
+    tree.strip_tags(['nav', 'header', 'footer', 'aside', 'script', 'style', 'form', 'button'])
+
+    # Focus on main content areas
+    main_content = tree.css_first('main') or tree.css_first('article') or tree.css_first(CONTENT_DIV_SELECTOR)
+    if main_content is None:
+        return ''
+    # Skip hidden text
+    for node in main_content.css('[style*="display: none"], [style*="visibility: hidden"]'):
+        node.decompose()
+    return main_content.text(separator=' ', strip=True)
+
+# Function to extract main content from rendered HTML
+def extract_rendered_content(html):
+    """Extract main content from rendered HTML using BeautifulSoup."""
+    # Parse page source with BeautifulSoup
+    soup = BeautifulSoup(html, 'lxml', parse_only=MAIN_CONTENT_STRAINER)
+
+    # Remove unwanted sections (footer, nav, etc.)
+    for element in soup(['nav', 'header', 'footer', 'aside', 'script', 'style', 'form', 'button', 'div.footer', 'div.navbar']):
+        element.decompose()
+
+    # Focus on main content areas
+    main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=lambda x: x and ('content' in x.lower() or 'main' in x.lower() or 'article' in x.lower()))
+    
+    if main_content:
+        # Remove hidden elements so only visible text is extracted
+        for element in main_content.select('[style*="display: none"], [style*="visibility: hidden"]'):
+            element.decompose()
+        return main_content.get_text(separator=' ', strip=True)
+    return ''
@@ -1,13 +1,24 @@
 import streamlit as st
 import pandas as pd
-from bs4 import BeautifulSoup
+import httpx
+import asyncio
+import ahocorasick
+import numpy as np
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
-import time
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
 import re
 
+# Kept in its own module so Streamlit reruns reuse the compiled function
+from token_counter import count_tokens
+from content_extraction import CONTENT_DIV_SELECTOR, extract_rendered_content, extract_static_content
+
 # Configure Streamlit page
 st.set_page_config(page_title="SEO Content Analyzer", layout="wide")
 st.title("📊 SEO Content Analyzer")
@@ -16,47 +27,262 @@ st.markdown("Analyze website content while excluding unwanted sections like foot
 # Create tabs
 tab1, tab2, tab3 = st.tabs(["Single URL Analyzer", "Bulk Analyzer", "Keyword Tool"])
 
+# Densities are stored as floats and only formatted for display
+DENSITY_COLUMN = st.column_config.NumberColumn(format="%.2f%%")
+DENSITY_COLUMN_CONFIG = {"Density (%)": DENSITY_COLUMN}
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+HTTP_HEADERS = {"User-Agent": USER_AGENT}
+HTTP_TIMEOUT = 10
+# Static pages yielding less text than this are assumed to need JavaScript
+MIN_STATIC_CONTENT_CHARS = 200
+# Text length of the first content container, in the order the extractors
+# check them, so rendering waits for client-side content to fill it
+CONTENT_TEXT_LENGTH_JS = (
+    "const el = document.querySelector('main') || document.querySelector('article')"
+    " || document.querySelector(arguments[0]);"
+    " return el ? el.innerText.length : 0;"
+)
+# Number of pages rendered with Selenium in parallel during bulk analysis
+BULK_MAX_WORKERS = 8
+# Seconds fetched content stays cached, so re-analyzing a URL skips the fetch
+CONTENT_CACHE_TTL = 3600
+
+# Word pattern handles hyphenated words, apostrophes, etc.
+WORD_RE = re.compile(r"\b[\w'-]+\b")
+# Words and sentence terminators in one pattern so content is scanned once
+TOKEN_RE = re.compile(r"(?P<w>\b[\w'-]+\b)|(?P<s>[.!?]+)")
+# Content at least this long is counted with the JIT scanner; shorter content
+# doesn't amortize the call overhead
+JIT_MIN_CONTENT_CHARS = 20_000
+
+# Function to fetch a page over plain HTTP (fast path for static pages)
+def get_static_content(url):
+    """Fetch a page with httpx and extract its main content."""
+    try:
+        response = httpx.get(url, headers=HTTP_HEADERS, timeout=HTTP_TIMEOUT, follow_redirects=True)
+        response.raise_for_status()
+        return extract_static_content(response.text)
+    except Exception:
+        return ''
+
+async def _fetch_static_contents(urls):
+    limits = httpx.Limits(max_connections=20)
+    # Requests queue for a free connection, so only time out once one is in use
+    timeout = httpx.Timeout(HTTP_TIMEOUT, pool=None)
+    async with httpx.AsyncClient(headers=HTTP_HEADERS, timeout=timeout, follow_redirects=True, limits=limits) as client:
+        responses = await asyncio.gather(*(client.get(url) for url in urls), return_exceptions=True)
+    # Failed fetches are None so they can be kept out of the cache
+    return [
+        extract_static_content(response.text) if isinstance(response, httpx.Response) and response.is_success else None
+        for response in responses
+    ]
+
+class FetchError(Exception):
+    """Raised from cached fetch helpers so failed fetches are not cached.
+
+    ``content`` holds any text extracted before the failure.
+    """
+
+    def __init__(self, message, content=''):
+        super().__init__(message)
+        self.content = content
+
+# Only successful fetches are cached; _fetched is not hashed, so the cache is
+# keyed by URL alone. A URL missing from _fetched raises KeyError, which lets
+# callers check the cache before fetching.
+@st.cache_data(ttl=CONTENT_CACHE_TTL, show_spinner=False)
+def _cached_static_content(url, _fetched):
+    content = _fetched[url]
+    if content is None:
+        raise FetchError(f"Failed to fetch {url}")
+    return content
+
+# Function to fetch many pages concurrently over plain HTTP
+def get_static_contents(urls):
+    """Fetch pages concurrently with httpx and extract their main content.
+
+    Pages cached by an earlier run are reused; pages that failed to fetch get
+    empty content.
+    """
+    contents = {}
+    misses = []
+    for url in urls:
+        try:
+            contents[url] = _cached_static_content(url, {})
+        except KeyError:
+            misses.append(url)
+
+    if misses:
+        fetched = dict(zip(misses, asyncio.run(_fetch_static_contents(misses))))
+        for url in misses:
+            try:
+                contents[url] = _cached_static_content(url, fetched)
+            except FetchError:
+                contents[url] = ''
+    return [contents[url] for url in urls]
+
+# Only successful fetches are cached; errors raise and are retried next time
+@st.cache_data(ttl=CONTENT_CACHE_TTL, show_spinner=False)
+def _cached_clean_content(url):
+    content = get_static_content(url)
+    if len(content) >= MIN_STATIC_CONTENT_CHARS:
+        return content
+    try:
+        return get_rendered_content(url) or content
+    except Exception as e:
+        # Keep the static text, but don't cache it so rendering is retried
+        raise FetchError(str(e), content) from e
+
 # Function to clean content and exclude unwanted sections
 def get_clean_content(url):
-    """Extract main content using Selenium and exclude unwanted sections."""
+    """Extract main content, rendering with Selenium only when the static page has none."""
     try:
-        # Configure Chrome options
-        options = Options()
-        options.add_argument("--headless=new")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-
-        # Initialize WebDriver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        driver.get(url)
-        time.sleep(5)  # Wait longer for dynamic content to load
-        
-        # Parse page source with BeautifulSoup
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        return _cached_clean_content(url)
+    except FetchError as e:
+        st.error(f"Error processing {url}: {str(e)}")
+        return e.content
+
+# Cache the ChromeDriver install so it is resolved once, not per URL
+@st.cache_resource(show_spinner=False)
+def _driver_path():
+    """Return the ChromeDriver path, installing it on first use per server process."""
+    return ChromeDriverManager().install()
+
+def _make_driver():
+    """Start a headless Chrome WebDriver."""
+    # Configure Chrome options
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument(f"user-agent={USER_AGENT}")
+
+    service = Service(_driver_path())
+    return webdriver.Chrome(service=service, options=options)
+
+def fetch_html(driver, url):
+    """Load a page in an existing WebDriver and return its rendered source."""
+    driver.get(url)  # Returns once document.readyState is complete
+    try:
+        # Wait up to 5s for dynamic content to fill the main content area
+        WebDriverWait(driver, 5).until(
+            lambda d: d.execute_script(CONTENT_TEXT_LENGTH_JS, CONTENT_DIV_SELECTOR) >= MIN_STATIC_CONTENT_CHARS
+        )
+    except TimeoutException:
+        pass  # Parse whatever has loaded
+    return driver.page_source
+
+# Function to render a page with Selenium and exclude unwanted sections
+def get_rendered_content(url):
+    """Extract main content using Selenium and exclude unwanted sections.
+
+    Errors are raised to the caller.
+    """
+    driver = _make_driver()
+    try:
+        return extract_rendered_content(fetch_html(driver, url))
+    finally:
         driver.quit()
 
-        # Remove unwanted sections (footer, nav, etc.)
-        for element in soup(['nav', 'header', 'footer', 'aside', 'script', 'style', 'form', 'button', 'div.footer', 'div.navbar']):
-            element.decompose()
-
-        # Focus on main content areas
-        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=lambda x: x and ('content' in x.lower() or 'main' in x.lower() or 'article' in x.lower()))
-        
-        if main_content:
-            # Extract text only from visible elements (skip hidden text)
-            content = []
-            for element in main_content.find_all(text=True):
-                if element.parent.name not in ['script', 'style']:  # Skip script and style tags
-                    if not element.parent.has_attr('style') or ('display: none' not in element.parent['style'] and 'visibility: hidden' not in element.parent['style']):
-                        content.append(element.strip())
-            return ' '.join([text for text in content if text])
-        return ''
-    except Exception as e:
-        st.error(f"Error processing {url}: {str(e)}")
-        return ''
+# Only successful renders are cached; _render is not hashed, so the cache is
+# keyed by URL alone and no driver is started on a cache hit
+@st.cache_data(ttl=CONTENT_CACHE_TTL, show_spinner=False)
+def _cached_rendered_content(url, _render):
+    return _render(url)
+
+# Function to render many pages with Selenium, reusing WebDrivers across URLs
+def iter_rendered_contents(urls):
+    """Render pages in parallel and yield ``(index, content)`` as each one finishes.
+
+    Rendered pages are cached per URL. Each worker thread keeps a WebDriver for
+    all of its URLs; a driver that errors is replaced, and every driver is quit
+    once rendering is finished.
+    """
+    ctx = get_script_run_ctx()
+    idle_drivers = queue.SimpleQueue()
+    drivers = []
+
+    def render_with_pooled_driver(url):
+        try:
+            driver = idle_drivers.get_nowait()
+        except queue.Empty:
+            driver = _make_driver()
+            drivers.append(driver)
+        try:
+            content = extract_rendered_content(fetch_html(driver, url))
+        except Exception:
+            # The driver may have crashed; replace it rather than reuse it
+            drivers.remove(driver)
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            raise
+        idle_drivers.put(driver)
+        return content
+
+    def render(url):
+        try:
+            return _cached_rendered_content(url, render_with_pooled_driver)
+        except Exception as e:
+            st.error(f"Error processing {url}: {str(e)}")
+            return ''
+
+    try:
+        # Attach workers to this script run so their errors still show
+        with ThreadPoolExecutor(max_workers=BULK_MAX_WORKERS, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+            futures = {executor.submit(render, url): i for i, url in enumerate(urls)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+    finally:
+        for driver in drivers:
+            driver.quit()
+
+# Function to parse the comma separated keywords input
+def parse_keywords(text):
+    """Split keywords on commas, dropping empty and case-insensitive duplicate entries."""
+    seen = set()
+    keywords = []
+    for keyword in text.split(","):
+        keyword = keyword.strip()
+        if keyword and keyword.lower() not in seen:
+            seen.add(keyword.lower())
+            keywords.append(keyword)
+    return keywords
+
+# Function to count keywords in a single pass over the content
+def count_keywords(lower_content, keywords):
+    """Count case-insensitive, non-overlapping keyword instances with Aho-Corasick.
+
+    ``lower_content`` must already be lowercased so callers do it once per document.
+    Matches ``str.count`` semantics per keyword and supports multi-word keywords.
+    Returns one count per entry in ``keywords``.
+    """
+    normalized = [keyword.strip().lower() for keyword in keywords]
+    automaton = ahocorasick.Automaton()
+    for kw in normalized:
+        if kw:
+            automaton.add_word(kw, kw)
+    if len(automaton) == 0:
+        return [0] * len(keywords)
+    automaton.make_automaton()
+
+    counts = {}
+    last_end = {}
+    for end, kw in automaton.iter(lower_content):
+        # Skip matches overlapping the previous counted match of the same keyword
+        if end - len(kw) >= last_end.get(kw, -1):
+            counts[kw] = counts.get(kw, 0) + 1
+            last_end[kw] = end
+    return [counts.get(kw, 0) for kw in normalized]
+
+def count_sentences(buf):
+    """Count runs of ``.!?`` bytes in UTF-8 bytes, matching ``[.!?]+``."""
+    mask = (buf == 46) | (buf == 33) | (buf == 63)
+    # Only the first terminator of each run starts a sentence end
+    return int(np.count_nonzero(mask & ~np.r_[False, mask[:-1]]))
 
 # Function to analyze content
 def analyze_content(content, keywords):
@@ -65,21 +291,31 @@ def analyze_content(content, keywords):
         return 0, 0, []
     
     # Improved word counting (handles hyphenated words, apostrophes, etc.)
-    words = re.findall(r'\b[\w\'-]+\b', content)
-    word_count = len(words)
-    sentence_count = len(re.findall(r'[.!?]+', content))
+    if len(content) >= JIT_MIN_CONTENT_CHARS:
+        buf = np.frombuffer(content.encode('utf-8'), dtype=np.uint8)
+        if content.isascii():
+            word_count, sentence_count = count_tokens(buf)
+        else:
+            # Byte scanning only matches \w for ASCII, so Unicode words use the regex
+            word_count = sum(1 for _ in WORD_RE.finditer(content))
+            sentence_count = count_sentences(buf)
+    else:
+        word_count = sentence_count = 0
+        for match in TOKEN_RE.finditer(content):
+            if match.lastgroup == 'w':
+                word_count += 1
+            else:
+                sentence_count += 1
+    lower_content = content.lower()
     
     results = []
-    for keyword in keywords:
-        kw = keyword.strip().lower()
-        # Count keyword instances (case-insensitive and supports multi-word keywords)
-        instances = content.lower().count(kw)
+    for keyword, instances in zip(keywords, count_keywords(lower_content, keywords)):
         # Calculate density
-        density = (instances / word_count * 100) if word_count > 0 else 0
+        density = (instances / word_count * 100) if word_count > 0 else 0.0
         results.append({
             "Keyword": keyword,
             "Instances": instances,
-            "Density (%)": f"{density:.2f}%"
+            "Density (%)": density
         })
     
     return word_count, sentence_count, results
@@ -93,7 +329,7 @@ with tab1:
     if st.button("Analyze Single URL", type="primary"):
         if url and keywords:
             with st.spinner("Analyzing content..."):
-                keywords_list = [k.strip() for k in keywords.split(",")]
+                keywords_list = parse_keywords(keywords)
                 content = get_clean_content(url)
                 
                 if content:
@@ -112,7 +348,7 @@ with tab1:
                     # Keyword Analysis Table
                     st.subheader("🔑 Keyword Analysis")
                     analysis_df = pd.DataFrame(analysis)
-                    st.dataframe(analysis_df, use_container_width=True)
+                    st.dataframe(analysis_df, use_container_width=True, column_config=DENSITY_COLUMN_CONFIG)
                     
                     # Debug: Show extracted content
                     if st.checkbox("Show Extracted Content"):
@@ -148,35 +384,51 @@ with tab2:
         with st.spinner("Analyzing bulk URLs..."):
             try:
                 # Read URLs from file
+                # Only the first column holds URLs, so skip parsing the rest
                 if uploaded_file.name.endswith(".csv"):
-                    urls = pd.read_csv(uploaded_file).iloc[:, 0].dropna().tolist()
+                    urls = pd.read_csv(uploaded_file, usecols=[0], dtype=str).iloc[:, 0].dropna().tolist()
                 elif uploaded_file.name.endswith(".xlsx"):
-                    urls = pd.read_excel(uploaded_file).iloc[:, 0].dropna().tolist()
+                    urls = pd.read_excel(uploaded_file, usecols=[0], dtype=str).iloc[:, 0].dropna().tolist()
                 elif uploaded_file.name.endswith(".txt"):
-                    urls = [line.strip() for line in uploaded_file]
+                    # utf-8-sig drops a BOM that would corrupt the first URL
+                    urls = [line.decode("utf-8-sig") for line in uploaded_file]
+                # Strip whitespace, then drop blank lines and duplicates so each URL is fetched once
+                urls = list(dict.fromkeys(url.strip() for url in urls if url.strip()))
                 
-                keywords_list = [k.strip() for k in bulk_keywords.split(",")]
-                results = []
+                keywords_list = parse_keywords(bulk_keywords)
+                # Build the report column-wise; repeated keywords share one column
+                density_columns = {f"{kw} Density": i for i, kw in enumerate(keywords_list)}
+                columns = {"URL": [], "Word Count": [], "Sentence Count": [], **{column: [] for column in density_columns}}
                 
                 progress_bar = st.progress(0)
-                for i, url in enumerate(urls):
-                    content = get_clean_content(url)
+                # Fetch static pages concurrently, then render the rest with Selenium
+                contents = get_static_contents(urls)
+                pending = [i for i, content in enumerate(contents) if len(content) < MIN_STATIC_CONTENT_CHARS]
+                completed = len(urls) - len(pending)
+                progress_bar.progress(completed / max(len(urls), 1))
+
+                for j, content in iter_rendered_contents([urls[i] for i in pending]):
+                    i = pending[j]
+                    contents[i] = content or contents[i]
+                    completed += 1
+                    progress_bar.progress(completed / len(urls))
+
+                for url, content in zip(urls, contents):
                     if content:
                         word_count, sentence_count, analysis = analyze_content(content, keywords_list)
                         # Add results for each URL
-                        results.append({
-                            "URL": url,
-                            "Word Count": word_count,
-                            "Sentence Count": sentence_count,
-                            **{f"{kw} Density": next((a["Density (%)"] for a in analysis if a["Keyword"] == kw), "0.00%") for kw in keywords_list}
-                        })
-                    progress_bar.progress((i + 1) / len(urls))
+                        columns["URL"].append(url)
+                        columns["Word Count"].append(word_count)
+                        columns["Sentence Count"].append(sentence_count)
+                        # analyze_content returns results in keywords_list order
+                        for column, i in density_columns.items():
+                            columns[column].append(analysis[i]["Density (%)"])
                 
-                if results:
-                    df = pd.DataFrame(results)
+                if columns["URL"]:
+                    df = pd.DataFrame(columns)
                     st.success("Bulk analysis complete! 🎉")
                     st.subheader("📊 Bulk Analysis Results")
-                    st.dataframe(df, use_container_width=True)
+                    st.dataframe(df, use_container_width=True, column_config={column: DENSITY_COLUMN for column in density_columns})
                     
                     # CTA for Bulk Analysis
                     st.download_button(
@@ -199,21 +451,19 @@ with tab3:
     
     if text_content and tool_keywords and st.button("Analyze Keywords", type="primary"):
         with st.spinner("Analyzing keywords..."):
-            keywords_list = [k.strip() for k in tool_keywords.split(",")]
-            words = re.findall(r'\b[\w\'-]+\b', text_content)
+            keywords_list = parse_keywords(tool_keywords)
+            words = WORD_RE.findall(text_content)
             word_count = len(words)
+            lower_content = text_content.lower()
             
             results = []
-            for keyword in keywords_list:
-                kw = keyword.lower()
-                # Count keyword instances (case-insensitive and supports multi-word keywords)
-                instances = text_content.lower().count(kw)
+            for keyword, instances in zip(keywords_list, count_keywords(lower_content, keywords_list)):
                 # Calculate density
-                density = (instances / word_count * 100) if word_count > 0 else 0
+                density = (instances / word_count * 100) if word_count > 0 else 0.0
                 results.append({
                     "Keyword": keyword,
                     "Instances": instances,
-                    "Density (%)": f"{density:.2f}%"
+                    "Density (%)": density
                 })
             
             st.success("Keyword analysis complete! 🎉")
@@ -229,7 +479,7 @@ with tab3:
             # Keyword Analysis Table
             st.subheader("🔑 Keyword Analysis")
             analysis_df = pd.DataFrame(results)
-            st.dataframe(analysis_df, use_container_width=True)
+            st.dataframe(analysis_df, use_container_width=True, column_config=DENSITY_COLUMN_CONFIG)
             
             # CTA for Keyword Tool
             st.download_button(
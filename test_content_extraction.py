@@ -0,0 +1,13 @@
+import pytest
+
+from content_extraction import extract_rendered_content, extract_static_content
+
+
+@pytest.mark.parametrize("html", [
+    "<header><div class='header-content'>Logo Menu</div></header><div class='content'>Real article text</div>",
+    "<aside><div class='sidebar-content'>Related links</div></aside><div class='content'>Real article text</div>",
+    "<nav><div class='main-menu'>Home About</div></nav><div class='content'>Real article text</div>",
+])
+@pytest.mark.parametrize("extract", [extract_rendered_content, extract_static_content])
+def test_divs_inside_unwanted_sections_are_skipped(extract, html):
+    assert extract(html) == "Real article text"
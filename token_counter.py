@@ -0,0 +1,31 @@
+from numba import njit
+
+
+@njit(cache=True)
+def count_tokens(buf):
+    """Count words and sentences in ASCII bytes, matching ``main.TOKEN_RE``.
+
+    A word is a run of ``[\\w'-]`` bytes holding at least one ``\\w`` byte and a
+    sentence is a run of ``.!?`` bytes.
+    """
+    words = 0
+    sentences = 0
+    in_run = False
+    run_has_word = False
+    in_terminators = False
+    for b in buf:
+        is_word = (48 <= b <= 57) or (65 <= b <= 90) or (97 <= b <= 122) or b == 95
+        if is_word or b == 39 or b == 45:
+            if not in_run:
+                in_run = True
+                run_has_word = False
+            if is_word and not run_has_word:
+                run_has_word = True
+                words += 1
+        else:
+            in_run = False
+        is_terminator = b == 46 or b == 33 or b == 63
+        if is_terminator and not in_terminators:
+            sentences += 1
+        in_terminators = is_terminator
+    return words, sentences